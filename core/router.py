@@ -3,6 +3,7 @@ Smart Router Node - LLM-powered decision making logic for the ClickHouse Agent
 """
 
 from typing import Literal
+from functools import lru_cache
 import json
 import logging
 from core.state import ClickHouseAgentState
@@ -10,6 +11,11 @@ from llm.custom_gpt import CustomGPT
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1)
+def _get_router_llm() -> CustomGPT:
+    """Build the routing LLM client once and reuse it for every question."""
+    return CustomGPT()
+
 def smart_router_node(state: ClickHouseAgentState) -> ClickHouseAgentState:
     """
     Smart router node that uses LLM to analyze the user question and decide workflow path.
@@ -34,7 +40,7 @@ def smart_router_node(state: ClickHouseAgentState) -> ClickHouseAgentState:
 
     try:
         # Use LLM to classify the question
-        llm = CustomGPT()
+        llm = _get_router_llm()
         classification = _classify_question_with_llm(llm, question)
 
         # Set the query type based on LLM decision
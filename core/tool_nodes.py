@@ -3,11 +3,22 @@ Tool Nodes - Structured tool execution for the LangGraph workflow
 """
 
 from typing import Dict, Any
+from functools import lru_cache
 import logging
 from core.state import ClickHouseAgentState
+from tools.query_execution_tool import QueryExecutionTool
+from tools.csv_export_tool import CsvExportTool
+from tools.modern_visualization_tool import ModernVisualizationTool
+from tools.smart_schema_tool import SmartSchemaTool
+from tools.response_formatter_tool import ResponseFormatterTool
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
+def _get_tool(tool_class):
+    """Build each tool once and reuse it across graph invocations."""
+    return tool_class()
+
 def execute_query_node(state: ClickHouseAgentState) -> ClickHouseAgentState:
     """
     Tool Node: Execute SQL query against ClickHouse database.
@@ -21,8 +32,7 @@ def execute_query_node(state: ClickHouseAgentState) -> ClickHouseAgentState:
         print(f"   🔒 Safety: Validation and limits applied")
 
     try:
-        from tools.query_execution_tool import QueryExecutionTool
-        tool = QueryExecutionTool()
+        tool = _get_tool(QueryExecutionTool)
 
         sql_query = state["sql_generation"].get("sql_query", "")
 
@@ -77,8 +87,7 @@ def export_csv_node(state: ClickHouseAgentState) -> ClickHouseAgentState:
         print(f"   📁 Output: Timestamped file in exports/ directory")
 
     try:
-        from tools.csv_export_tool import CsvExportTool
-        tool = CsvExportTool()
+        tool = _get_tool(CsvExportTool)
 
         query_result = state["query_execution"]
         user_question = state["user_question"]
@@ -137,8 +146,7 @@ def create_visualization_node(state: ClickHouseAgentState) -> ClickHouseAgentSta
         print(f"   🎨 Style: Modern, fancy, lightweight with Chart.js")
 
     try:
-        from tools.modern_visualization_tool import ModernVisualizationTool
-        tool = ModernVisualizationTool()
+        tool = _get_tool(ModernVisualizationTool)
 
         query_result = state["query_execution"]
         user_question = state["user_question"]
@@ -211,8 +219,7 @@ def smart_schema_node(state: ClickHouseAgentState) -> ClickHouseAgentState:
         print(f"   🔗 Method: ClickHouse SDK + LLM analysis + Hardcoded fallback")
 
     try:
-        from tools.smart_schema_tool import SmartSchemaTool
-        tool = SmartSchemaTool()
+        tool = _get_tool(SmartSchemaTool)
 
         user_question = state["user_question"]
 
@@ -258,8 +265,7 @@ def format_response_node(state: ClickHouseAgentState) -> ClickHouseAgentState:
         print(f"   📋 Input: Query results, CSV info, visualization info, user question")
 
     try:
-        from tools.response_formatter_tool import ResponseFormatterTool
-        tool = ResponseFormatterTool()
+        tool = _get_tool(ResponseFormatterTool)
 
         query_type = state["query_type"]
 
@@ -78,9 +78,11 @@ class ClickHouseConnection:
         """Test if connection is alive."""
         try:
             if not self._is_connected:
+                # _connect already verifies the link with SELECT 1
                 self._connect()
-            if self.client:
+            elif self.client:
                 self.client.query("SELECT 1")
+            if self.client:
                 return True
         except Exception as e:
             logger.error(f"Connection test failed: {e}")
@@ -4,14 +4,25 @@ CSV export tool for saving query results.
 
 import csv
 import os
+import re
 from typing import Dict, Any, List
 from langchain.tools import BaseTool
 from pydantic import Field
 from datetime import datetime
 import logging
+from tools.file_utils import atomic_write
 
 logger = logging.getLogger(__name__)
 
+# Timestamp formats used for export filenames and datetime cell values
+FILENAME_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+CSV_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Precompiled filename cleaning patterns
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r'[^\w\s\-_]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_REPEATED_UNDERSCORES_RE = re.compile(r'_+')
+
 class CsvExportTool(BaseTool):
     """Tool for exporting query results to CSV files."""
 
@@ -40,12 +51,15 @@ class CsvExportTool(BaseTool):
                     'message': 'Query returned no results or data is not exportable'
                 }
 
+            # Read the clock once so the filename and the metadata footer agree
+            generated_at = datetime.now()
+
             # Generate filename if not provided
             if not filename:
-                filename = self._generate_filename(user_question)
+                filename = self._generate_filename(user_question, generated_at)
 
             # Get data from query result
-            export_data = self._extract_export_data(query_result)
+            export_data = self._extract_export_data(query_result, generated_at)
 
             # Create CSV file
             file_path = self._create_csv_file(export_data, filename)
@@ -80,9 +94,9 @@ class CsvExportTool(BaseTool):
 
         return len(data) > 0 and len(columns) > 0
 
-    def _generate_filename(self, user_question: str = "") -> str:
+    def _generate_filename(self, user_question: str = "", generated_at: datetime = None) -> str:
         """Generate a filename based on timestamp and question."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = (generated_at or datetime.now()).strftime(FILENAME_TIMESTAMP_FORMAT)
 
         if user_question:
             # Clean question for filename
@@ -98,15 +112,14 @@ class CsvExportTool(BaseTool):
     def _clean_filename(self, text: str) -> str:
         """Clean text to be safe for filename."""
         # Keep only alphanumeric, spaces, hyphens, underscores
-        import re
-        clean_text = re.sub(r'[^\w\s\-_]', '', text)
+        clean_text = _UNSAFE_FILENAME_CHARS_RE.sub('', text)
         # Replace spaces with underscores
-        clean_text = re.sub(r'\s+', '_', clean_text)
+        clean_text = _WHITESPACE_RE.sub('_', clean_text)
         # Remove multiple underscores
-        clean_text = re.sub(r'_+', '_', clean_text)
+        clean_text = _REPEATED_UNDERSCORES_RE.sub('_', clean_text)
         return clean_text.lower()
 
-    def _extract_export_data(self, query_result: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_export_data(self, query_result: Dict[str, Any], generated_at: datetime = None) -> Dict[str, Any]:
         """Extract data for CSV export."""
         result_data = query_result.get('result', {})
 
@@ -115,25 +128,23 @@ class CsvExportTool(BaseTool):
             'data': result_data.get('data', []),
             'row_count': result_data.get('row_count', 0),
             'query': query_result.get('executed_query', ''),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': (generated_at or datetime.now()).isoformat()
         }
 
     def _create_csv_file(self, export_data: Dict[str, Any], filename: str) -> str:
         """Create the actual CSV file."""
         file_path = os.path.join(self.export_dir, filename)
 
-        with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
+        with atomic_write(file_path, 'w', newline='', encoding='utf-8') as csvfile:
             writer = csv.writer(csvfile)
 
             # Write headers
             columns = export_data['columns']
             writer.writerow(columns)
 
-            # Write data rows
-            for row in export_data['data']:
-                # Convert each value to string and handle None values
-                csv_row = [self._format_csv_value(value) for value in row]
-                writer.writerow(csv_row)
+            # Write data rows in a single call, converting values to strings and handling None
+            format_value = self._format_csv_value
+            writer.writerows([format_value(value) for value in row] for row in export_data['data'])
 
             # Write metadata as comments (optional)
             if export_data.get('query'):
@@ -152,24 +163,27 @@ class CsvExportTool(BaseTool):
         elif isinstance(value, (int, float)):
             return str(value)
         elif isinstance(value, datetime):
-            return value.strftime("%Y-%m-%d %H:%M:%S")
+            return value.strftime(CSV_DATETIME_FORMAT)
         else:
             return str(value)
 
     def _get_file_stats(self, file_path: str) -> Dict[str, Any]:
         """Get file statistics."""
         try:
-            stat = os.stat(file_path)
-            return {
-                'size_bytes': stat.st_size,
-                'size_human': self._format_file_size(stat.st_size),
-                'created': datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                'absolute_path': os.path.abspath(file_path)
-            }
+            return self._build_file_stats(file_path, os.stat(file_path))
         except Exception as e:
             logger.error(f"Failed to get file stats: {e}")
             return {'error': str(e)}
 
+    def _build_file_stats(self, file_path: str, stat: os.stat_result) -> Dict[str, Any]:
+        """Build the file statistics dict from an existing stat result."""
+        return {
+            'size_bytes': stat.st_size,
+            'size_human': self._format_file_size(stat.st_size),
+            'created': datetime.fromtimestamp(stat.st_ctime).isoformat(),
+            'absolute_path': os.path.abspath(file_path)
+        }
+
     def _format_file_size(self, size_bytes: int) -> str:
         """Format file size in human readable format."""
         for unit in ['B', 'KB', 'MB', 'GB']:
@@ -182,15 +196,20 @@ class CsvExportTool(BaseTool):
         """List all exported CSV files."""
         try:
             files = []
-            for filename in os.listdir(self.export_dir):
-                if filename.endswith('.csv'):
-                    file_path = os.path.join(self.export_dir, filename)
-                    stats = self._get_file_stats(file_path)
-                    files.append({
-                        'filename': filename,
-                        'path': file_path,
-                        **stats
-                    })
+            # scandir yields the entry type with the listing, so only CSV files are stat'ed
+            with os.scandir(self.export_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.csv') and entry.is_file():
+                        try:
+                            stats = self._build_file_stats(entry.path, entry.stat())
+                        except OSError as e:
+                            logger.error(f"Failed to get file stats: {e}")
+                            stats = {'error': str(e)}
+                        files.append({
+                            'filename': entry.name,
+                            'path': entry.path,
+                            **stats
+                        })
 
             # Sort by creation time (newest first)
             files.sort(key=lambda x: x.get('created', ''), reverse=True)
@@ -0,0 +1,32 @@
+"""
+File helpers shared by the tools that write export and chart files.
+"""
+
+import os
+import uuid
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+
+@contextmanager
+def atomic_write(file_path: str, mode: str = 'w', **open_kwargs) -> Iterator[IO]:
+    """
+    Open a temporary file next to file_path and move it into place once writing succeeds.
+
+    Readers never see a partially written file. Every call gets its own uniquely named
+    temporary file, so concurrent writers to the same path cannot clobber each other's
+    temp file, and the temporary file is removed if anything fails before the swap.
+    """
+    tmp_path = f"{file_path}.{uuid.uuid4().hex}.tmp"
+
+    try:
+        # 'x' creates the file exclusively with the usual permissions (mkstemp would force 0600)
+        with open(tmp_path, mode.replace('w', 'x'), **open_kwargs) as f:
+            yield f
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
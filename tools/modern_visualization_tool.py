@@ -3,18 +3,44 @@ UTF-8 Fixed Professional Visualization Tool - FIXED INDENTATION ISSUE
 """
 
 from typing import Dict, Any, List, Optional, ClassVar
+from functools import lru_cache
 from langchain.tools import BaseTool
 from pydantic import Field
 import json
+import html
 import os
 import logging
 from datetime import datetime
 from llm.custom_gpt import CustomGPT
+from tools.file_utils import atomic_write
 import unicodedata
 import re
 
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns for the label cleaning fallback and date sniffing helpers
+_UNSAFE_LABEL_CHARS_RE = re.compile(r'[^\w\s\-\.\/\(\)&]+')
+# YYYY-MM-DD, MM/DD/YYYY, MM-DD-YYYY, YYYY/MM/DD in a single scan
+_DATE_LIKE_RE = re.compile(r'\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4}|\d{2}-\d{2}-\d{4}|\d{4}/\d{2}/\d{2}')
+
+@lru_cache(maxsize=4096)
+def _clean_text_utf8(text: str) -> str:
+    """Memoized label cleaning; the same labels are cleaned while preparing data and again while rendering."""
+    # Remove surrogate characters and other problematic Unicode
+    try:
+        # Normalize the string
+        normalized = unicodedata.normalize('NFKD', text)
+        # Remove non-ASCII characters that might cause issues (single linear pass, no regex)
+        cleaned = normalized.encode('ascii', 'ignore').decode('ascii')
+        # If the cleaned string is empty, try a different approach
+        if not cleaned.strip():
+            # Keep only alphanumeric and common punctuation
+            cleaned = _UNSAFE_LABEL_CHARS_RE.sub('', text)
+        return cleaned.strip()
+    except:
+        # Last resort: convert to ASCII
+        return text.encode('ascii', 'ignore').decode('ascii')
+
 class ModernVisualizationTool(BaseTool):
     """Create professional, minimalistic visualizations with proper UTF-8 handling."""
 
@@ -27,6 +53,40 @@ class ModernVisualizationTool(BaseTool):
     export_dir: str = Field(default="visualizations")
     llm: CustomGPT = Field(default_factory=CustomGPT)
 
+    # Static lookup tables, shared by every chart instead of rebuilt per call
+    COLOR_SCHEMES: ClassVar[Dict[str, List[str]]] = {
+        'professional_blue': ['#4299e1', '#63b3ed', '#90cdf4', '#bee3f8', '#ebf8ff'],
+        'professional_green': ['#48bb78', '#68d391', '#9ae6b4', '#c6f6d5', '#f0fff4'],
+        'professional_purple': ['#9f7aea', '#b794f6', '#d6bcfa', '#e9d8fd', '#faf5ff'],
+        'warm': ['#f56565', '#fc8181', '#feb2b2', '#fed7d7', '#fff5f5'],
+        'cool': ['#4fd1c7', '#81e6d9', '#b2f5ea', '#c6f7f4', '#f0fdfa']
+    }
+
+    CHARTJS_TYPES: ClassVar[Dict[str, str]] = {
+        'bar': 'bar',
+        'horizontal_bar': 'bar',
+        'line': 'line',
+        'area': 'line',
+        'pie': 'pie',
+        'doughnut': 'doughnut',
+        'scatter': 'scatter',
+        'bubble': 'bubble',
+        'radar': 'radar',
+        'polar': 'polarArea'
+    }
+
+    MONTH_NAMES: ClassVar[Dict[int, str]] = {
+        1: 'January', 2: 'February', 3: 'March', 4: 'April',
+        5: 'May', 6: 'June', 7: 'July', 8: 'August',
+        9: 'September', 10: 'October', 11: 'November', 12: 'December'
+    }
+
+    MONTH_NAMES_FR: ClassVar[Dict[int, str]] = {
+        1: 'Janvier', 2: 'Février', 3: 'Mars', 4: 'Avril',
+        5: 'Mai', 6: 'Juin', 7: 'Juillet', 8: 'Août',
+        9: 'Septembre', 10: 'Octobre', 11: 'Novembre', 12: 'Décembre'
+    }
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         # Create visualizations directory if it doesn't exist
@@ -59,14 +119,19 @@ class ModernVisualizationTool(BaseTool):
             # Extract user chart preference from intent analysis
             user_chart_preference = self._extract_user_chart_preference(intent_analysis)
 
+            # Detect time series once; both the analysis and the chart data preparation use it
+            time_info = self._detect_time_series_columns(columns, cleaned_data)
+
             # Analyze data structure and determine best visualization type
-            viz_analysis = self._analyze_data_for_visualization_safe(columns, cleaned_data, user_question, user_chart_preference)
+            viz_analysis = self._analyze_data_for_visualization_safe(columns, cleaned_data, user_question, user_chart_preference,
+                                                                     time_info=time_info)
 
             if self._should_log_debug():
                 logger.info(f"LLM Analysis Result: {viz_analysis}")
 
             # Generate the visualization
-            html_file = self._create_professional_visualization_safe(columns, cleaned_data, viz_analysis, user_question)
+            html_file = self._create_professional_visualization_safe(columns, cleaned_data, viz_analysis, user_question,
+                                                                     time_info=time_info)
 
             # Get file stats
             file_stats = self._get_file_stats(html_file)
@@ -152,20 +217,7 @@ class ModernVisualizationTool(BaseTool):
         if not text:
             return text
 
-        # Remove surrogate characters and other problematic Unicode
-        try:
-            # Normalize the string
-            normalized = unicodedata.normalize('NFKD', text)
-            # Remove non-ASCII characters that might cause issues
-            cleaned = re.sub(r'[^\x00-\x7F]+', '', normalized)
-            # If the cleaned string is empty, try a different approach
-            if not cleaned.strip():
-                # Keep only alphanumeric and common punctuation
-                cleaned = re.sub(r'[^\w\s\-\.\/\(\)&]+', '', text)
-            return cleaned.strip()
-        except:
-            # Last resort: convert to ASCII
-            return text.encode('ascii', 'ignore').decode('ascii')
+        return _clean_text_utf8(text)
 
     def _is_visualizable(self, query_result: Dict[str, Any]) -> bool:
         """Check if query results are suitable for visualization."""
@@ -193,11 +245,13 @@ class ModernVisualizationTool(BaseTool):
         return has_numeric
 
     def _analyze_data_for_visualization_safe(self, columns: List[str], data: List[List], user_question: str,
-                                             user_chart_preference: Optional[str] = None) -> Dict[str, Any]:
+                                             user_chart_preference: Optional[str] = None,
+                                             time_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Enhanced analysis with user chart preference support."""
 
-        # Detect time series first
-        time_info = self._detect_time_series_columns(columns, data)
+        # Detect time series first (unless the caller already did)
+        if time_info is None:
+            time_info = self._detect_time_series_columns(columns, data)
 
         # Prepare comprehensive data analysis
         sample_data = []
@@ -345,20 +399,17 @@ class ModernVisualizationTool(BaseTool):
                 value_column = time_info['value_column']['name']
             else:
                 # Find first numeric column that's not a time column
-                value_column = None
-                time_columns = [
-                    time_info.get('year_column', {}).get('name'),
-                    time_info.get('month_column', {}).get('name'),
-                    time_info.get('date_column', {}).get('name')
-                ]
-
-                for col in columns:
-                    if col not in time_columns and self._column_is_numeric(col, columns, data):
-                        value_column = col
-                        break
+                # (unset time slots are None, so fall back to {} before reading the name)
+                time_columns = {
+                    (time_info.get(key) or {}).get('name')
+                    for key in ('year_column', 'month_column', 'date_column')
+                }
 
-                if not value_column:
-                    value_column = columns[-1] if columns else 'Value'
+                value_column = next(
+                    (col for col in columns
+                     if col not in time_columns and self._column_is_numeric(col, columns, data)),
+                    columns[-1] if columns else 'Value'
+                )
 
         else:
             # Use standard fallback logic
@@ -483,13 +534,13 @@ class ModernVisualizationTool(BaseTool):
         # Ensure columns exist
         if label_col not in columns:
             # Find first text column or use first column
-            text_cols = [col for col in columns if self._column_is_text(col, columns, data)]
-            parsed['label_column'] = text_cols[0] if text_cols else columns[0]
+            parsed['label_column'] = next(
+                (col for col in columns if self._column_is_text(col, columns, data)), columns[0])
 
         if value_col not in columns:
             # Find first numeric column or use last column
-            numeric_cols = [col for col in columns if self._column_is_numeric(col, columns, data)]
-            parsed['value_column'] = numeric_cols[0] if numeric_cols else columns[-1]
+            parsed['value_column'] = next(
+                (col for col in columns if self._column_is_numeric(col, columns, data)), columns[-1])
 
         # Add intelligent defaults based on chart type
         if chart_type in ['pie', 'doughnut']:
@@ -596,14 +647,7 @@ class ModernVisualizationTool(BaseTool):
             return False
 
         # Simple date pattern detection
-        date_patterns = [
-            r'\d{4}-\d{2}-\d{2}',  # YYYY-MM-DD
-            r'\d{2}/\d{2}/\d{4}',  # MM/DD/YYYY
-            r'\d{2}-\d{2}-\d{4}',  # MM-DD-YYYY
-            r'\d{4}/\d{2}/\d{2}',  # YYYY/MM/DD
-        ]
-
-        return any(re.search(pattern, value) for pattern in date_patterns)
+        return _DATE_LIKE_RE.search(value) is not None
 
     def _analyze_column_types(self, columns: List[str], data: List[List]) -> Dict[str, str]:
         """Analyze what type of data each column contains."""
@@ -631,7 +675,8 @@ class ModernVisualizationTool(BaseTool):
                 return col
         return None
 
-    def _create_professional_visualization_safe(self, columns: List[str], data: List[List], viz_analysis: Dict[str, Any], user_question: str) -> str:
+    def _create_professional_visualization_safe(self, columns: List[str], data: List[List], viz_analysis: Dict[str, Any], user_question: str,
+                                                time_info: Optional[Dict[str, Any]] = None) -> str:
         """Create the professional HTML visualization file with safe UTF-8 handling."""
 
         # Generate filename
@@ -640,7 +685,7 @@ class ModernVisualizationTool(BaseTool):
         filepath = os.path.join(self.export_dir, filename)
 
         # Prepare data for Chart.js with FIXED mapping
-        chart_data = self._prepare_chart_data_fixed(columns, data, viz_analysis)
+        chart_data = self._prepare_chart_data_fixed(columns, data, viz_analysis, time_info)
 
         if self._should_log_debug():
             logger.info(f"Chart data prepared: {chart_data}")
@@ -648,25 +693,22 @@ class ModernVisualizationTool(BaseTool):
         # Generate HTML content with safe encoding
         html_content = self._generate_professional_html_template_safe(chart_data, viz_analysis, user_question)
 
-        # Write to file with proper encoding
-        try:
-            with open(filepath, 'w', encoding='utf-8', errors='replace') as f:
-                f.write(html_content)
-        except UnicodeEncodeError:
-            # Fallback to ASCII if UTF-8 fails
-            with open(filepath, 'w', encoding='ascii', errors='replace') as f:
-                f.write(html_content)
+        # Write to file with proper encoding (errors='replace' keeps odd characters from failing the write)
+        with atomic_write(filepath, 'w', encoding='utf-8', errors='replace') as f:
+            f.write(html_content)
 
         logger.info(f"Professional visualization created: {filepath}")
         return filepath
 
-    def _prepare_chart_data_fixed(self, columns: List[str], data: List[List], viz_analysis: Dict[str, Any]) -> Dict[str, Any]:
+    def _prepare_chart_data_fixed(self, columns: List[str], data: List[List], viz_analysis: Dict[str, Any],
+                                  time_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Prepare data with ENHANCED support for time series and proper column mapping."""
 
         chart_type = viz_analysis.get('chart_type', 'bar')
 
-        # Enhanced logic to detect time series data
-        time_info = self._detect_time_series_columns(columns, data)
+        # Enhanced logic to detect time series data (unless the caller already did)
+        if time_info is None:
+            time_info = self._detect_time_series_columns(columns, data)
 
         if time_info['is_time_series']:
             # Handle time series data specially
@@ -724,24 +766,10 @@ class ModernVisualizationTool(BaseTool):
         labels = []
         values = []
 
-        # Month names mapping
-        month_names = {
-            1: 'January', 2: 'February', 3: 'March', 4: 'April',
-            5: 'May', 6: 'June', 7: 'July', 8: 'August',
-            9: 'September', 10: 'October', 11: 'November', 12: 'December'
-        }
-
-        # French month names (if French is detected)
-        month_names_fr = {
-            1: 'Janvier', 2: 'Février', 3: 'Mars', 4: 'Avril',
-            5: 'Mai', 6: 'Juin', 7: 'Juillet', 8: 'Août',
-            9: 'Septembre', 10: 'Octobre', 11: 'Novembre', 12: 'Décembre'
-        }
-
         # Detect language (simple check)
         user_question = viz_analysis.get('title', '').lower()
         is_french = any(word in user_question for word in ['mois', 'année', 'évolution', 'par'])
-        month_map = month_names_fr if is_french else month_names
+        month_map = self.MONTH_NAMES_FR if is_french else self.MONTH_NAMES
 
         # Sort data by time (year, then month if available)
         sorted_data = sorted(data, key=lambda row: (
@@ -927,6 +955,10 @@ class ModernVisualizationTool(BaseTool):
         title = self._clean_string_utf8(viz_analysis.get('title', 'Data Analysis'))
         clean_user_question = self._clean_string_utf8(user_question)
 
+        # Escape the free-text slots before they are interpolated into the page
+        title = html.escape(title or "")
+        clean_user_question = html.escape(clean_user_question or "")
+
         # Professional color schemes
         colors = ['#4299e1', '#63b3ed', '#90cdf4', '#bee3f8', '#ebf8ff']
 
@@ -1164,16 +1196,7 @@ class ModernVisualizationTool(BaseTool):
         chart_type = viz_analysis.get('chart_type', 'bar')
         chart_options = viz_analysis.get('chart_specific_options', {})
 
-        # Extended color schemes
-        color_schemes = {
-            'professional_blue': ['#4299e1', '#63b3ed', '#90cdf4', '#bee3f8', '#ebf8ff'],
-            'professional_green': ['#48bb78', '#68d391', '#9ae6b4', '#c6f6d5', '#f0fff4'],
-            'professional_purple': ['#9f7aea', '#b794f6', '#d6bcfa', '#e9d8fd', '#faf5ff'],
-            'warm': ['#f56565', '#fc8181', '#feb2b2', '#fed7d7', '#fff5f5'],
-            'cool': ['#4fd1c7', '#81e6d9', '#b2f5ea', '#c6f7f4', '#f0fdfa']
-        }
-
-        selected_colors = color_schemes.get(viz_analysis.get('color_scheme', 'professional_blue'), colors)
+        selected_colors = self.COLOR_SCHEMES.get(viz_analysis.get('color_scheme', 'professional_blue'), colors)
 
         # Base configuration
         config = {
@@ -1192,19 +1215,7 @@ class ModernVisualizationTool(BaseTool):
 
     def _get_chartjs_type(self, chart_type: str) -> str:
         """Map our chart types to Chart.js types."""
-        type_mapping = {
-            'bar': 'bar',
-            'horizontal_bar': 'bar',
-            'line': 'line',
-            'area': 'line',
-            'pie': 'pie',
-            'doughnut': 'doughnut',
-            'scatter': 'scatter',
-            'bubble': 'bubble',
-            'radar': 'radar',
-            'polar': 'polarArea'
-        }
-        return type_mapping.get(chart_type, 'bar')
+        return self.CHARTJS_TYPES.get(chart_type, 'bar')
 
     def _build_chart_data(self, chart_data: Dict[str, Any], viz_analysis: Dict[str, Any], colors: List[str]) -> Dict[str, Any]:
         """Enhanced chart data building with proper time series support."""
@@ -1606,14 +1617,6 @@ class ModernVisualizationTool(BaseTool):
 
         return config_json
 
-    def _format_file_size(self, size_bytes: int) -> str:
-        """Format file size in human readable format."""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f} TB"
-
     def _should_log_debug(self) -> bool:
         """Check if debug logging should be enabled."""
-        return logger.isEnabledFor(logging.DEBUG) or True  # Enable for debugging
\ No newline at end of file
+        return logger.isEnabledFor(logging.DEBUG)
\ No newline at end of file
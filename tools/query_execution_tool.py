@@ -10,6 +10,13 @@ from database.connection import clickhouse_connection
 
 logger = logging.getLogger(__name__)
 
+# Query validation: precompiled comment pattern and keywords matched as substrings of the upper-cased query
+_SQL_LINE_COMMENT_RE = re.compile(r'--.*$', re.MULTILINE)
+_DANGEROUS_KEYWORDS = (
+    'DROP', 'DELETE', 'UPDATE', 'INSERT', 'ALTER', 'CREATE',
+    'TRUNCATE', 'REPLACE', 'EXEC', 'EXECUTE', 'SYSTEM'
+)
+
 class QueryExecutionTool(BaseTool):
     """Tool for executing SQL queries safely on ClickHouse."""
 
@@ -59,26 +66,21 @@ class QueryExecutionTool(BaseTool):
     def _validate_query(self, query: str) -> bool:
         """Validate SQL query for security and safety."""
         # Remove comments and normalize whitespace
-        clean_query = re.sub(r'--.*$', '', query, flags=re.MULTILINE)
+        clean_query = _SQL_LINE_COMMENT_RE.sub('', query)
         clean_query = ' '.join(clean_query.split())
         clean_query = clean_query.upper()
 
-        # Check for dangerous operations
-        dangerous_keywords = [
-            'DROP', 'DELETE', 'UPDATE', 'INSERT', 'ALTER', 'CREATE',
-            'TRUNCATE', 'REPLACE', 'EXEC', 'EXECUTE', 'SYSTEM'
-        ]
+        # Ensure query starts with SELECT (cheap prefix check first)
+        if not clean_query.startswith('SELECT'):
+            logger.warning("Query does not start with SELECT")
+            return False
 
-        for keyword in dangerous_keywords:
+        # Check for dangerous operations
+        for keyword in _DANGEROUS_KEYWORDS:
             if keyword in clean_query:
                 logger.warning(f"Dangerous keyword '{keyword}' found in query")
                 return False
 
-        # Ensure query starts with SELECT
-        if not clean_query.strip().startswith('SELECT'):
-            logger.warning("Query does not start with SELECT")
-            return False
-
         return True
 
     def _add_safety_limits(self, query: str, default_limit: int = 1000) -> str:
@@ -94,43 +96,18 @@ class QueryExecutionTool(BaseTool):
             return {
                 'columns': raw_result['columns'],
                 'data': [],
-                'formatted_data': [],
                 'row_count': 0,
                 'summary': "No data found"
             }
 
-        # Format data for better readability
-        formatted_data = []
-        for row in raw_result['data']:
-            formatted_row = {}
-            for i, col in enumerate(raw_result['columns']):
-                value = row[i] if i < len(row) else None
-                formatted_row[col] = self._format_value(value, raw_result['types'][i])
-            formatted_data.append(formatted_row)
-
         return {
             'columns': raw_result['columns'],
             'data': raw_result['data'],
-            'formatted_data': formatted_data,
             'types': raw_result['types'],
             'row_count': len(raw_result['data']),
             'summary': f"Found {len(raw_result['data'])} rows with {len(raw_result['columns'])} columns"
         }
 
-    def _format_value(self, value: Any, data_type: str) -> Any:
-        """Format individual values based on their type."""
-        if value is None:
-            return None
-
-        if 'Int' in data_type or 'UInt' in data_type:
-            return int(value)
-        elif 'Float' in data_type or 'Decimal' in data_type:
-            return float(value)
-        elif 'DateTime' in data_type:
-            return str(value)
-        else:
-            return value
-
     def _parse_clickhouse_error(self, error_msg: str) -> Dict[str, str]:
         """Parse ClickHouse error messages for user-friendly explanations."""
         error_info = {
@@ -125,15 +125,20 @@ class ResponseFormatterTool(BaseTool):
             # Limit display to first 20 rows for readability
             display_data = data[:20]
 
+            # Format every displayed cell once; widths and rows both read from this grid
+            format_cell = self._format_professional_cell_value
+            formatted_cells = [
+                [format_cell(row[i]) if i < len(row) else "" for i in range(len(columns))]
+                for row in display_data
+            ]
+
             # Calculate column widths
             col_widths = {}
             for i, col in enumerate(columns):
                 col_widths[i] = max(len(str(col)), 10)  # Minimum width of 10
 
-                for row in display_data:
-                    if i < len(row):
-                        formatted_value = self._format_professional_cell_value(row[i])
-                        col_widths[i] = max(col_widths[i], len(str(formatted_value)))
+                for cells in formatted_cells:
+                    col_widths[i] = max(col_widths[i], len(cells[i]))
 
                 # Cap maximum width at 25 characters for cleaner display
                 col_widths[i] = min(col_widths[i], 25)
@@ -150,15 +155,12 @@ class ResponseFormatterTool(BaseTool):
             table_lines.append(separator)
 
             # Data rows
-            for row in display_data:
+            for cells in formatted_cells:
                 formatted_row = []
-                for i, col in enumerate(columns):
-                    value = row[i] if i < len(row) else ""
-                    formatted_value = self._format_professional_cell_value(value)
-
+                for i, formatted_value in enumerate(cells):
                     # Truncate if too long
-                    if len(str(formatted_value)) > 25:
-                        formatted_value = str(formatted_value)[:22] + "..."
+                    if len(formatted_value) > 25:
+                        formatted_value = formatted_value[:22] + "..."
 
                     formatted_row.append(f"{formatted_value:<{col_widths[i]}}")
 
@@ -211,6 +213,7 @@ class ResponseFormatterTool(BaseTool):
                 return ""
 
             insights = []
+            max_insights = 4  # Limit to 4 insights for cleanliness; stop scanning once reached
 
             # Row count insight
             record_count = len(data)
@@ -218,6 +221,9 @@ class ResponseFormatterTool(BaseTool):
 
             # Analyze numeric columns
             for i, col in enumerate(columns):
+                if len(insights) >= max_insights:
+                    break
+
                 numeric_values = []
                 for row in data:
                     if i < len(row) and isinstance(row[i], (int, float)):
@@ -232,18 +238,23 @@ class ResponseFormatterTool(BaseTool):
 
             # Unique values for categorical columns (limit to relevant ones)
             for i, col in enumerate(columns):
+                if len(insights) >= max_insights:
+                    break
+
                 unique_values = set()
                 total_values = 0
                 for row in data:
                     if i < len(row) and row[i] is not None:
                         unique_values.add(row[i])
                         total_values += 1
+                        if len(unique_values) > 20:
+                            break  # Too many distinct values to report; no need to finish the scan
 
                 if len(unique_values) <= 20 and len(unique_values) > 1 and total_values > 0:
                     percentage = (len(unique_values) / total_values) * 100
                     insights.append(f"• {col}: {len(unique_values)} unique values ({percentage:.1f}% distinct)")
 
-            return "\n".join(insights[:4])  # Limit to 4 insights for cleanliness
+            return "\n".join(insights)
 
         except Exception as e:
             logger.error(f"Insight generation error: {e}")
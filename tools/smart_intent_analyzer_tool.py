@@ -3,6 +3,7 @@ Streamlined Smart Intent Analyzer - Essential functionality only
 """
 
 from typing import Dict, Any
+from functools import lru_cache
 from langchain.tools import BaseTool
 from pydantic import Field
 import json
@@ -12,6 +13,37 @@ from config.schemas import TABLE_SCHEMAS, TABLE_RELATIONSHIPS, BUSINESS_SCENARIO
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1)
+def _focused_schema_context() -> str:
+    """Render the schema context once; TABLE_SCHEMAS is static for the process lifetime."""
+    context = "# ClickHouse Database Schema\n\n"
+
+    # Essential table info only
+    for table_name, schema in TABLE_SCHEMAS.items():
+        context += f"## {table_name}\n"
+        context += f"Purpose: {schema.get('description', '')}\n"
+        context += f"Key columns: "
+
+        # Only show most important columns
+        key_columns = []
+        for col_name, col_info in schema.get('columns', {}).items():
+            if (col_info.get('is_primary_key') or
+                col_info.get('foreign_key') or
+                col_info.get('is_geographic') or
+                col_info.get('is_temporal') or
+                'NAME' in col_name.upper()):
+                key_columns.append(f"{col_name} ({col_info['type']})")
+
+        context += ", ".join(key_columns[:5]) + "\n\n"
+
+    # Essential relationships
+    context += "# Key Relationships\n"
+    context += "- RM_AGGREGATED_DATA → CUSTOMER (via PARTY_ID) for customer names\n"
+    context += "- RM_AGGREGATED_DATA → PLMN (via PLMN) for country info (COUNTRY_ISO3)\n"
+    context += "- RM_AGGREGATED_DATA → CELL (via CELL_ID) for location coordinates\n\n"
+
+    return context
+
 class SmartIntentAnalyzerTool(BaseTool):
     """Streamlined LLM-powered intent analyzer for semantic understanding."""
 
@@ -50,33 +82,7 @@ class SmartIntentAnalyzerTool(BaseTool):
 
     def _build_focused_context(self) -> str:
         """Build minimal but complete schema context."""
-        context = "# ClickHouse Database Schema\n\n"
-
-        # Essential table info only
-        for table_name, schema in TABLE_SCHEMAS.items():
-            context += f"## {table_name}\n"
-            context += f"Purpose: {schema.get('description', '')}\n"
-            context += f"Key columns: "
-
-            # Only show most important columns
-            key_columns = []
-            for col_name, col_info in schema.get('columns', {}).items():
-                if (col_info.get('is_primary_key') or
-                    col_info.get('foreign_key') or
-                    col_info.get('is_geographic') or
-                    col_info.get('is_temporal') or
-                    'NAME' in col_name.upper()):
-                    key_columns.append(f"{col_name} ({col_info['type']})")
-
-            context += ", ".join(key_columns[:5]) + "\n\n"
-
-        # Essential relationships
-        context += "# Key Relationships\n"
-        context += "- RM_AGGREGATED_DATA → CUSTOMER (via PARTY_ID) for customer names\n"
-        context += "- RM_AGGREGATED_DATA → PLMN (via PLMN) for country info (COUNTRY_ISO3)\n"
-        context += "- RM_AGGREGATED_DATA → CELL (via CELL_ID) for location coordinates\n\n"
-
-        return context
+        return _focused_schema_context()
 
     def _get_semantic_analysis(self, user_question: str, schema_context: str) -> str:
         """Get focused LLM analysis with chart type detection."""
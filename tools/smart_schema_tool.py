@@ -126,10 +126,11 @@ JSON Response:"""
             schema = TABLE_SCHEMAS[table_name]
 
             # Try to enhance with ClickHouse data if possible
+            # (overlay on a shallow view so the shared TABLE_SCHEMAS entry is never mutated)
             try:
                 clickhouse_data = self._get_clickhouse_table_info(table_name)
                 if clickhouse_data:
-                    schema['clickhouse_info'] = clickhouse_data
+                    schema = {**schema, 'clickhouse_info': clickhouse_data}
             except Exception as e:
                 logger.warning(f"ClickHouse enhancement failed: {e}")
 
@@ -170,19 +171,17 @@ JSON Response:"""
 
         tables_info = {}
 
+        # Fetch ClickHouse info for every table in one round-trip (errors yield an empty dict)
+        clickhouse_info = self._get_clickhouse_tables_info(list(TABLE_SCHEMAS.keys()))
+
         for table_name, schema in TABLE_SCHEMAS.items():
             tables_info[table_name] = {
                 'description': schema.get('description', 'No description'),
                 'column_count': len(schema.get('columns', {}))
             }
 
-            # Try to add ClickHouse info if possible
-            try:
-                clickhouse_info = self._get_clickhouse_table_info(table_name)
-                if clickhouse_info:
-                    tables_info[table_name].update(clickhouse_info)
-            except:
-                pass  # Ignore ClickHouse errors for table listing
+            if table_name in clickhouse_info:
+                tables_info[table_name].update(clickhouse_info[table_name])
 
         return {
             'operation': 'list_tables',
@@ -192,27 +191,33 @@ JSON Response:"""
 
     def _get_clickhouse_table_info(self, table_name: str) -> Dict[str, Any]:
         """Get additional info from ClickHouse (non-critical)."""
+        return self._get_clickhouse_tables_info([table_name]).get(table_name)
+
+    def _get_clickhouse_tables_info(self, table_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get additional info for several tables from ClickHouse in a single query (non-critical)."""
+
+        tables_info = {}
 
         try:
+            name_list = ", ".join(f"'{name}'" for name in table_names)
             info_query = f"""
-            SELECT total_rows, total_bytes
+            SELECT name, total_rows, total_bytes
             FROM system.tables 
-            WHERE database = currentDatabase() AND name = '{table_name}'
+            WHERE database = currentDatabase() AND name IN ({name_list})
             """
 
             result = clickhouse_connection.execute_query_with_names(info_query)
 
-            if result.get("data") and len(result["data"]) > 0:
-                row = result["data"][0]
-                return {
-                    'total_rows': row[0] if len(row) > 0 else 0,
-                    'total_bytes': row[1] if len(row) > 1 else 0,
-                    'size_human': self._format_bytes(row[1]) if len(row) > 1 else "Unknown"
+            for row in result.get("data") or []:
+                tables_info[row[0]] = {
+                    'total_rows': row[1] if len(row) > 1 else 0,
+                    'total_bytes': row[2] if len(row) > 2 else 0,
+                    'size_human': self._format_bytes(row[2]) if len(row) > 2 else "Unknown"
                 }
         except Exception as e:
-            logger.debug(f"ClickHouse table info failed for {table_name}: {e}")
+            logger.debug(f"ClickHouse table info failed for {table_names}: {e}")
 
-        return None
+        return tables_info
 
     def _format_response_with_llm(self, user_question: str, extracted_info: Dict[str, Any], schema_data: Dict[str, Any]) -> str:
         """Use LLM to create a user-friendly response."""
@@ -3,6 +3,7 @@ Streamlined Smart SQL Generator - Focused on efficient SQL generation
 """
 
 from typing import Dict, Any
+from functools import lru_cache
 from langchain.tools import BaseTool
 from pydantic import Field
 import logging
@@ -11,6 +12,19 @@ from config.schemas import TABLE_SCHEMAS
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
+def _table_schema_block(table_name: str) -> str:
+    """Render one table's column listing once; TABLE_SCHEMAS is static for the process lifetime."""
+    schema = TABLE_SCHEMAS[table_name]
+    block = f"## {table_name}\n"
+
+    # Essential columns only
+    for col_name, col_info in schema.get('columns', {}).items():
+        block += f"- {col_name} ({col_info['type']}): {col_info['description']}\n"
+    block += "\n"
+
+    return block
+
 class SmartSqlGeneratorTool(BaseTool):
     """Streamlined SQL generator focused on accurate ClickHouse queries."""
 
@@ -65,13 +79,7 @@ class SmartSqlGeneratorTool(BaseTool):
         # Only include relevant table schemas
         for table_name in required_tables:
             if table_name in TABLE_SCHEMAS:
-                schema = TABLE_SCHEMAS[table_name]
-                context += f"## {table_name}\n"
-
-                # Essential columns only
-                for col_name, col_info in schema.get('columns', {}).items():
-                    context += f"- {col_name} ({col_info['type']}): {col_info['description']}\n"
-                context += "\n"
+                context += _table_schema_block(table_name)
 
         # Add specific join patterns if needed
         join_analysis = intent_analysis.get('join_analysis', {})